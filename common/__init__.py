@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Helicone tutorial examples.
+
+Scripts in each part add the repository root to sys.path so they can
+import from this package when run directly.
+"""
@@ -0,0 +1,24 @@
+"""
+Console Output Helpers
+
+Shared formatting for the examples' printed previews of model responses.
+"""
+
+
+def quiet(*args, **kwargs) -> None:
+    """Drop-in for print() when a function's progress output is turned off."""
+
+
+def head(text: str, n: int = 100) -> str:
+    """
+    Return the first n characters of text, with "..." only if it was cut.
+
+    Args:
+        text: Response text to preview
+        n: Most characters to keep
+    """
+
+    if len(text) <= n:
+        return text
+    return text[:n] + "..."
+
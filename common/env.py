@@ -0,0 +1,24 @@
+"""
+Environment Checks
+
+Shared guard for the examples' __main__ blocks.
+"""
+
+import os
+import sys
+
+
+def require_env(*keys: str) -> None:
+    """
+    Exit with an error if any of the given environment variables is unset.
+
+    Args:
+        keys: Variable names, e.g. "HELICONE_API_KEY", "OPENAI_API_KEY"
+    """
+
+    missing = [key for key in keys if not os.environ.get(key)]
+    if missing:
+        sys.exit(
+            f"❌ Error: {', '.join(missing)} not found\n"
+            "Please create a .env file with your API keys (see .env.example)"
+        )
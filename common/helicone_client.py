@@ -0,0 +1,94 @@
+"""
+Shared Helicone Client
+
+Every example talks to the same Helicone endpoints, so they share one
+OpenAI client per base URL. Reusing the client keeps its httpx connection
+pool (and the TCP + TLS handshakes behind it) alive across examples.
+"""
+
+from functools import lru_cache
+from openai import AsyncOpenAI, OpenAI
+import httpx
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GATEWAY_URL = "https://ai-gateway.helicone.ai"
+
+# Keep sockets open between requests so back-to-back calls skip the handshake
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=50,
+    max_connections=100,
+    keepalive_expiry=60,
+)
+
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+def http_client(**kwargs) -> httpx.Client:
+    """
+    Build an HTTP/2 httpx.Client with the shared pool settings.
+
+    HTTP/2 multiplexes concurrent requests over one TCP + TLS connection
+    (both Helicone endpoints negotiate it via ALPN).
+    """
+
+    return httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, **kwargs)
+
+
+def async_http_client(**kwargs) -> httpx.AsyncClient:
+    """Async counterpart of http_client()."""
+
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, **kwargs)
+
+
+def get_client(base_url: str = GATEWAY_URL) -> OpenAI:
+    """
+    Return the shared OpenAI client for a Helicone base URL.
+
+    Args:
+        base_url: Helicone endpoint (defaults to the AI Gateway)
+
+    Returns:
+        OpenAI client authenticated with HELICONE_API_KEY
+    """
+
+    # Always pass base_url positionally so get_client() and
+    # get_client(GATEWAY_URL) hit the same cache entry
+    return _cached_client(base_url)
+
+
+@lru_cache(maxsize=4)
+def _cached_client(base_url: str) -> OpenAI:
+    return OpenAI(
+        base_url=base_url,
+        api_key=os.getenv("HELICONE_API_KEY"),
+        http_client=http_client(),
+    )
+
+
+def get_async_client(base_url: str = GATEWAY_URL) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for a Helicone base URL.
+
+    The underlying connection pool belongs to the first event loop that
+    uses it, so drive all async calls from a single asyncio.run().
+
+    Args:
+        base_url: Helicone endpoint (defaults to the AI Gateway)
+
+    Returns:
+        AsyncOpenAI client authenticated with HELICONE_API_KEY
+    """
+
+    return _cached_async_client(base_url)
+
+
+@lru_cache(maxsize=4)
+def _cached_async_client(base_url: str) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=os.getenv("HELICONE_API_KEY"),
+        http_client=async_http_client(),
+    )
@@ -0,0 +1,52 @@
+"""
+Helicone Header Sets
+
+HeliconeHeaders is an immutable header set for one agent in one session;
+callers that reuse a combination (e.g. a cached per-agent client) build it
+once and share its dict.
+
+The H_* names are interned header-name constants. Dicts built from them in
+different modules share one string object per name, so key comparisons
+are pointer checks.
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+H_SESSION_ID = sys.intern("Helicone-Session-Id")
+H_SESSION_PATH = sys.intern("Helicone-Session-Path")
+H_SESSION_NAME = sys.intern("Helicone-Session-Name")
+H_USER_ID = sys.intern("Helicone-User-Id")
+H_AGENT = sys.intern("Helicone-Property-Agent")
+H_DEPARTMENT = sys.intern("Helicone-Property-Department")
+H_CACHE_ENABLED = sys.intern("Helicone-Cache-Enabled")
+H_CACHE_CONTROL = sys.intern("Cache-Control")
+
+
+@dataclass(frozen=True, slots=True)
+class HeliconeHeaders:
+    """Immutable Helicone header set for one agent in one session."""
+
+    session_id: str
+    agent_name: str = ""
+    session_path: str = ""
+    base: tuple = ()  # Static (name, value) pairs shared by every agent
+    _headers: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        headers = dict(self.base)
+        headers[H_SESSION_ID] = self.session_id
+
+        if self.agent_name:
+            headers[H_AGENT] = self.agent_name
+
+        if self.session_path:
+            headers[H_SESSION_PATH] = self.session_path
+
+        object.__setattr__(self, "_headers", headers)
+
+    def as_dict(self) -> dict:
+        """Return the shared header dict (do not mutate it)."""
+
+        return self._headers
+
@@ -0,0 +1,182 @@
+"""
+Background Log Shipper
+
+Fire-and-forget logging for async (non-proxy) Helicone integrations.
+Requests go straight to the provider; an httpx response hook copies each
+request/response pair onto a bounded queue, and a single worker thread
+ships queued records to Helicone in batches over one kept-alive connection.
+
+Usage:
+    shipper = HeliconeLogShipper(api_key=os.getenv("HELICONE_API_KEY"))
+    client = OpenAI(http_client=httpx.Client(
+        event_hooks={"response": [shipper.on_response]},
+    ))
+"""
+
+import atexit
+import queue
+import threading
+import time
+import httpx
+import orjson
+
+LOG_URL = "https://api.worker.helicone.ai/custom/v1/log"
+
+
+class HeliconeLogShipper:
+    """Ship request logs to Helicone from one background worker thread."""
+
+    def __init__(
+        self,
+        api_key: str,
+        log_url: str = LOG_URL,
+        max_queue: int = 10_000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Args:
+            api_key: Helicone API key
+            log_url: Helicone custom logging endpoint
+            max_queue: Records held before new ones are dropped
+            batch_size: Most records shipped per flush
+            flush_interval: Longest wait (seconds) before shipping a partial batch
+        """
+
+        self.log_url = log_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0  # Records lost: queue full, unreadable, or not accepted
+        self._dropped_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._http = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=10.0,
+        )
+
+        self._thread = threading.Thread(
+            target=self._drain, name="helicone-log-shipper", daemon=True
+        )
+        self._thread.start()
+
+        # Short-lived scripts exit right after their last call
+        atexit.register(self.flush)
+
+    def on_response(self, response: httpx.Response) -> None:
+        """Response hook for a sync httpx.Client; never raises into the caller's request."""
+
+        if _is_stream(response):
+            return
+        try:
+            response.read()
+            self._enqueue(response)
+        except Exception:
+            # e.g. RequestNotRead for streamed/multipart request bodies
+            self._drop()
+
+    async def on_response_async(self, response: httpx.Response) -> None:
+        """Response hook for an httpx.AsyncClient; never raises into the caller's request."""
+
+        if _is_stream(response):
+            return
+        try:
+            await response.aread()
+            self._enqueue(response)
+        except Exception:
+            self._drop()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait (up to timeout seconds) for queued records to be shipped."""
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _drop(self) -> None:
+        # Called from caller threads (hooks) and the worker thread alike
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def _enqueue(self, response: httpx.Response) -> None:
+        # Only copy raw bytes here; JSON work happens on the worker thread
+        end = time.time()
+        request = response.request
+        record = (
+            str(request.url),
+            request.content,
+            {k: v for k, v in request.headers.items() if k.startswith("helicone-")},
+            response.status_code,
+            response.content,
+            end - response.elapsed.total_seconds(),
+            end,
+        )
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Fire-and-forget: never block the caller on logging
+            self._drop()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._ship(batch)
+
+    def _ship(self, batch: list) -> None:
+        # The endpoint takes one record per request; the batch shares a
+        # single kept-alive connection
+        for record in batch:
+            try:
+                response = self._http.post(
+                    self.log_url,
+                    content=orjson.dumps(_payload(*record)),
+                    headers={"Content-Type": "application/json"},
+                )
+                if not response.is_success:
+                    # e.g. a wrong Helicone key: the record was rejected
+                    self._drop()
+            except Exception:
+                # A bad record or an unreachable Helicone must never stop
+                # the worker (or affect the app)
+                self._drop()
+            finally:
+                self._queue.task_done()
+
+
+def _is_stream(response: httpx.Response) -> bool:
+    # Reading a streamed body here would block until the last token
+    return response.headers.get("content-type", "").startswith("text/event-stream")
+
+
+def _timestamp(t: float) -> dict:
+    return {"seconds": int(t), "milliseconds": int(t * 1000) % 1000}
+
+
+def _payload(url, request_body, meta, status, response_body, start, end) -> dict:
+    return {
+        "providerRequest": {
+            "url": url,
+            "json": orjson.loads(request_body) if request_body else {},
+            "meta": meta,
+        },
+        "providerResponse": {
+            "json": orjson.loads(response_body) if response_body else {},
+            "status": status,
+        },
+        "timing": {
+            "startTime": _timestamp(start),
+            "endTime": _timestamp(end),
+        },
+    }
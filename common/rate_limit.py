@@ -0,0 +1,231 @@
+"""
+Client-Side Rate Limiting
+
+Mirrors a Helicone-RateLimit-Policy header with an in-process token bucket,
+so requests that Helicone would reject with a 429 fail locally instead of
+paying for a round-trip first. Helicone enforces the same policy server-side;
+the local bucket is only a pre-check.
+
+Usage:
+    response = limited_create(
+        client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[...],
+        extra_headers={POLICY_HEADER: POLICY_USER_HOURLY.header},
+    )
+
+For u=cents policies, follow up with charge(headers, cents) once the
+response's usage shows what the request cost.
+"""
+
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+POLICY_HEADER = "Helicone-RateLimit-Policy"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the local bucket for a policy has no tokens left."""
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket refilled continuously at capacity per window."""
+
+    capacity: float
+    refill_per_sec: float
+    tokens: float = field(init=False)
+    last: float = field(init=False)
+
+    def __post_init__(self):
+        # Start full
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+
+    def refill(self) -> None:
+        """Add the tokens earned since the last refill, up to capacity."""
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_per_sec)
+        self.last = now
+
+    def consume(self, cost: float = 1.0) -> bool:
+        """Take cost tokens if available; return whether they were taken."""
+
+        self.refill()
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+@dataclass(frozen=True, slots=True)
+class Policy:
+    """A parsed Helicone-RateLimit-Policy; .header is the canonical string."""
+
+    quota: int
+    window_s: int
+    unit: str = "requests"
+    segment: str | None = None
+    header: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "header", self.serialize())
+
+    def serialize(self) -> str:
+        """Build the header value, e.g. "500;w=86400;u=cents;s=user"."""
+
+        parts = [f"{self.quota};w={self.window_s}"]
+        if self.unit != "requests":
+            parts.append(f"u={self.unit}")
+        if self.segment:
+            parts.append(f"s={self.segment}")
+        return ";".join(parts)
+
+
+# Policies shared across the examples, parsed once at import
+POLICY_USER_HOURLY = Policy(100, 3600, segment="user")  # 100 req/hour per user
+POLICY_USER_DAILY_BUDGET = Policy(500, 86400, unit="cents", segment="user")  # $5/day per user
+
+
+@lru_cache(maxsize=128)
+def parse_policy(policy: str) -> Policy:
+    """
+    Parse a policy header value, e.g. "500;w=86400;u=cents;s=user".
+
+    Each distinct string is only split once.
+
+    Raises:
+        ValueError: The quota or window is missing or not a positive integer
+    """
+
+    quota, *params = policy.split(";")
+    options = dict(param.strip().partition("=")[::2] for param in params)
+
+    try:
+        parsed = Policy(
+            quota=int(quota),
+            window_s=int(options["w"]),
+            unit=options.get("u", "requests"),
+            segment=options.get("s"),
+        )
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate-limit policy {policy!r}; expected [quota];w=[window]...") from None
+
+    if parsed.quota <= 0 or parsed.window_s <= 0:
+        raise ValueError(f"Invalid rate-limit policy {policy!r}; quota and window must be positive")
+    return parsed
+
+
+# Buckets hold live state, so they are kept here rather than in an LRU cache
+# (evicting a drained bucket would silently hand back a full one)
+MAX_BUCKETS = 10_000  # Soft cap: only fully refilled buckets are ever pruned
+_buckets: dict[tuple[Policy, str], TokenBucket] = {}
+
+
+def _prune_full_buckets() -> None:
+    # A bucket that has refilled to capacity is indistinguishable from a new
+    # one, so dropping it never resets a live limit
+    for key, bucket in list(_buckets.items()):
+        bucket.refill()
+        if bucket.tokens >= bucket.capacity:
+            del _buckets[key]
+
+
+def bucket_for(policy: Policy, segment: str = "") -> TokenBucket:
+    """
+    Return the bucket for a policy and segment key (e.g. a user ID).
+
+    Later calls with the same arguments get the same bucket until it has
+    fully refilled and the store needs room.
+    """
+
+    key = (policy, segment)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        if len(_buckets) >= MAX_BUCKETS:
+            _prune_full_buckets()
+        bucket = _buckets[key] = TokenBucket(
+            capacity=float(policy.quota),
+            refill_per_sec=policy.quota / policy.window_s,
+        )
+    return bucket
+
+
+def _segment_key(segment: str | None, headers: dict) -> str:
+    # s=user buckets per Helicone-User-Id; any other segment per property value
+    if not segment:
+        return ""
+    if segment == "user":
+        return headers.get("Helicone-User-Id", "")
+
+    wanted = f"helicone-property-{segment}".lower()
+    for name, value in headers.items():
+        if name.lower() == wanted:
+            return value
+    return ",".join(v for k, v in headers.items() if k.lower().startswith("helicone-property-"))
+
+
+def _bucket_for_headers(headers: dict):
+    # The (policy, bucket) pair a request's headers select, or None if unlimited
+    policy = headers.get(POLICY_HEADER)
+    if not policy:
+        return None
+    parsed = parse_policy(policy)
+    return parsed, bucket_for(parsed, _segment_key(parsed.segment, headers))
+
+
+def limited_create(create, cost: float | None = None, **kwargs):
+    """
+    Call create(**kwargs) only if the local bucket for its policy has room.
+
+    Works with sync and async create methods; for async ones the check runs
+    before the coroutine is returned.
+
+    Request-count policies take cost (default 1) up front. For u=cents
+    policies the real cost is only known from the response's usage, so
+    without an explicit cost the call is only blocked once the budget is
+    already spent; report what it actually cost with charge() afterwards.
+
+    Args:
+        create: e.g. client.chat.completions.create
+        cost: Tokens to take up front (requests, or cents for u=cents policies)
+        kwargs: Passed through to create; extra_headers carries the policy
+
+    Raises:
+        RateLimitExceeded: The request would exceed the policy
+    """
+
+    selected = _bucket_for_headers(kwargs.get("extra_headers") or {})
+
+    if selected:
+        policy, bucket = selected
+        if cost is None and policy.unit == "cents":
+            bucket.refill()
+            allowed = bucket.tokens > 0
+        else:
+            allowed = bucket.consume(1.0 if cost is None else cost)
+
+        if not allowed:
+            raise RateLimitExceeded(f"Local rate limit reached for policy {policy.header!r}")
+
+    return create(**kwargs)
+
+
+def charge(headers: dict, cost: float) -> None:
+    """
+    Deduct a completed request's actual cost from its policy's bucket.
+
+    Args:
+        headers: The extra_headers the request was sent with
+        cost: What the request cost, in the policy's unit (e.g. cents)
+    """
+
+    selected = _bucket_for_headers(headers)
+    if selected:
+        _, bucket = selected
+        bucket.refill()
+        # May go negative: the request has already been paid for
+        bucket.tokens -= cost
@@ -3,28 +3,67 @@ Async Logging - Zero Latency Observability
 
 This example demonstrates:
 - Zero-latency logging with direct provider calls
-- Async log shipping to Helicone
+- Async log shipping to Helicone (bounded queue + one worker thread)
 - Fault isolation (Helicone outages don't affect your app)
 - Trade-offs: No proxy features (caching, rate limiting)
 
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from helicone_async import HeliconeAsyncLogger
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+import asyncio
 import os
+import sys
 import time
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import async_http_client, http_client
+from common.log_shipper import HeliconeLogShipper
+from common.env import require_env
+from common.display import head
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize async logger
-logger = HeliconeAsyncLogger(api_key=os.getenv("HELICONE_API_KEY"))
-logger.init()  # Patches the OpenAI client to intercept calls
+# One background worker ships logs for every client in this process
+shipper = HeliconeLogShipper(api_key=os.getenv("HELICONE_API_KEY"))
+
+# Standard OpenAI clients - calls go directly to OpenAI, and a response
+# hook hands each request/response pair to the shipper's queue
+client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=http_client(event_hooks={"response": [shipper.on_response]}),
+)
+aclient = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=async_http_client(
+        event_hooks={"response": [shipper.on_response_async]}
+    ),
+)
+
 
-# Standard OpenAI client - calls go directly to OpenAI
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async def one_call(prompt: str) -> float:
+    """Make a single request and return its latency in milliseconds."""
+
+    start_ns = time.perf_counter_ns()
+
+    await aclient.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=100,
+    )
+
+    return (time.perf_counter_ns() - start_ns) / 1_000_000
+
+
+async def run_calls(prompt: str, n: int) -> list:
+    """Fire n requests concurrently and collect per-call latencies."""
+
+    return await asyncio.gather(*[one_call(prompt) for _ in range(n)])
 
 
 def latency_test():
@@ -41,30 +80,21 @@ def latency_test():
 
     prompt = "What are the symptoms of hypertension?"
 
-    # Make 3 calls and measure latency
-    latencies = []
-
-    for i in range(3):
-        print(f"Call {i+1}/3...", end=" ")
-
-        start_time = time.time()
+    # Make 3 concurrent calls and measure each one's latency
+    print("Firing 3 concurrent calls...")
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=100,
-        )
+    wall_start_ns = time.perf_counter_ns()
+    latencies = asyncio.run(run_calls(prompt, 3))
+    wall_ms = (time.perf_counter_ns() - wall_start_ns) / 1_000_000
 
-        end_time = time.time()
-        latency_ms = (end_time - start_time) * 1000
-        latencies.append(latency_ms)
-
-        print(f"{latency_ms:.0f}ms")
+    for i, latency_ms in enumerate(latencies):
+        print(f"Call {i+1}/3... {latency_ms:.0f}ms")
 
     avg_latency = sum(latencies) / len(latencies)
 
     print()
     print(f"Average latency: {avg_latency:.0f}ms")
+    print(f"Total wall time: {wall_ms:.0f}ms")
     print()
     print("✅ All calls completed with zero added latency")
     print("   Logs are being shipped to Helicone asynchronously")
@@ -93,7 +123,7 @@ def fault_isolation_demo():
         max_tokens=100,
     )
 
-    print(f"✅ Response received: {response.choices[0].message.content[:100]}...")
+    print(f"✅ Response received: {head(response.choices[0].message.content)}")
     print()
     print("Even if Helicone is experiencing an outage:")
     print("  ✓ Your application is completely unaffected")
@@ -105,39 +135,40 @@ def fault_isolation_demo():
 def trade_offs_summary():
     """Print summary of async logging trade-offs."""
 
-    print("Async Logging Trade-offs")
-    print("=" * 60)
-    print()
-
-    print("✅ BENEFITS:")
-    print("  • Zero latency impact (0ms added)")
-    print("  • Complete fault isolation")
-    print("  • Full observability (costs, tokens, latency, responses)")
-    print("  • Per-user analytics and custom properties work normally")
-    print()
-
-    print("❌ LIMITATIONS:")
-    print("  • No response caching (can't reduce costs)")
-    print("  • No rate limiting (can't enforce quotas)")
-    print("  • No automatic retries with fallback")
-    print("  • No LLM security screening")
-    print()
-
-    print("💡 WHEN TO USE:")
-    print("  • Real-time chat applications (latency-critical)")
-    print("  • Voice assistants (every millisecond matters)")
-    print("  • High-frequency agent loops (hundreds of calls/second)")
-    print("  • Scenarios where observability is needed but not control")
-    print()
+    sys.stdout.write("\n".join([
+        "Async Logging Trade-offs",
+        "=" * 60,
+        "",
+        "✅ BENEFITS:",
+        "  • Zero latency impact (0ms added)",
+        "  • Complete fault isolation",
+        "  • Full observability (costs, tokens, latency, responses)",
+        "  • Per-user analytics and custom properties work normally",
+        "",
+        "❌ LIMITATIONS:",
+        "  • No response caching (can't reduce costs)",
+        "  • No rate limiting (can't enforce quotas)",
+        "  • No automatic retries with fallback",
+        "  • No LLM security screening",
+        "",
+        "💡 WHEN TO USE:",
+        "  • Real-time chat applications (latency-critical)",
+        "  • Voice assistants (every millisecond matters)",
+        "  • High-frequency agent loops (hundreds of calls/second)",
+        "  • Scenarios where observability is needed but not control",
+        "",
+    ]) + "\n")
 
 
 def main():
     """Run async logging examples."""
 
-    print("=" * 60)
-    print("Helicone Async Logging Example")
-    print("=" * 60)
-    print()
+    sys.stdout.write("\n".join([
+        "=" * 60,
+        "Helicone Async Logging Example",
+        "=" * 60,
+        "",
+    ]) + "\n")
 
     # Run latency test
     latency_test()
@@ -148,20 +179,16 @@ def main():
     # Show trade-offs summary
     trade_offs_summary()
 
-    print("=" * 60)
-    print("View your async-logged requests in Helicone dashboard:")
-    print("https://helicone.ai/dashboard")
-    print()
+    sys.stdout.write("\n".join([
+        "=" * 60,
+        "View your async-logged requests in Helicone dashboard:",
+        "https://helicone.ai/dashboard",
+        "",
+    ]) + "\n")
 
 
 if __name__ == "__main__":
     # Check for API keys
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
-
-    if not os.getenv("OPENAI_API_KEY"):
-        print("❌ Error: OPENAI_API_KEY not found")
-        exit(1)
+    require_env("HELICONE_API_KEY", "OPENAI_API_KEY")
 
     main()
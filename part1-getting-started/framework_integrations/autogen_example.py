@@ -10,13 +10,31 @@ This example demonstrates:
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from functools import lru_cache
 import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.helicone_headers import HeliconeHeaders
+from common.env import require_env
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+HELICONE_KEY = os.getenv("HELICONE_API_KEY")
+
+# Headers shared by every agent; only session-specific ones vary per client
+_BASE_HEADERS = {
+    "Helicone-Auth": f"Bearer {HELICONE_KEY}",
+    "Helicone-Session-Name": "AutoGen Multi-Agent Workflow",
+    "Helicone-Property-Framework": "autogen-v0.4",
+}
+_BASE_ITEMS = tuple(_BASE_HEADERS.items())
+
 
 def create_helicone_autogen_client(
     agent_name: str,
@@ -32,19 +50,22 @@ def create_helicone_autogen_client(
         session_path: Optional hierarchical path (e.g., "/triage/analysis")
 
     Returns:
-        OpenAIChatCompletionClient configured with Helicone
+        OpenAIChatCompletionClient configured with Helicone (shared per
+        agent/session/path combination)
     """
 
-    headers = {
-        "Helicone-Auth": f"Bearer {os.environ['HELICONE_API_KEY']}",
-        "Helicone-Session-Id": session_id,
-        "Helicone-Session-Name": "AutoGen Multi-Agent Workflow",
-        "Helicone-Property-Framework": "autogen-v0.4",
-        "Helicone-Property-Agent": agent_name,
-    }
+    # Normalize so None and "" share one cache entry
+    return _cached_autogen_client(agent_name, session_id, session_path or "")
+
 
-    if session_path:
-        headers["Helicone-Session-Path"] = session_path
+@lru_cache(maxsize=128)
+def _cached_autogen_client(agent_name: str, session_id: str, session_path: str):
+    # Imported here so the module loads fast when AutoGen isn't needed yet
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    # The client itself is cached per agent/session/path, so its headers are
+    # only assembled once without a second cache
+    headers = HeliconeHeaders(session_id, agent_name, session_path, _BASE_ITEMS).as_dict()
 
     model_client = OpenAIChatCompletionClient(
         model="gpt-4o-mini",
@@ -66,9 +87,11 @@ def medical_multi_agent_example():
     - Per-agent cost tracking
     """
 
-    print("AutoGen Medical Multi-Agent Example")
-    print("=" * 60)
-    print()
+    sys.stdout.write("\n".join([
+        "AutoGen Medical Multi-Agent Example",
+        "=" * 60,
+        "",
+    ]) + "\n")
 
     session_id = "autogen-medical-consult-001"
 
@@ -79,9 +102,11 @@ def medical_multi_agent_example():
         session_id=session_id,
         session_path="/medical-consult/triage"
     )
-    print(f"✅ Triage agent configured")
-    print(f"   Path: /medical-consult/triage")
-    print()
+    sys.stdout.write("\n".join([
+        f"✅ Triage agent configured",
+        f"   Path: /medical-consult/triage",
+        "",
+    ]) + "\n")
 
     # Create specialist agent client
     print("Setting up Specialist Agent...")
@@ -90,9 +115,11 @@ def medical_multi_agent_example():
         session_id=session_id,
         session_path="/medical-consult/specialist"
     )
-    print(f"✅ Specialist agent configured")
-    print(f"   Path: /medical-consult/specialist")
-    print()
+    sys.stdout.write("\n".join([
+        f"✅ Specialist agent configured",
+        f"   Path: /medical-consult/specialist",
+        "",
+    ]) + "\n")
 
     # Create report generator client
     print("Setting up Report Generator...")
@@ -101,28 +128,29 @@ def medical_multi_agent_example():
         session_id=session_id,
         session_path="/medical-consult/report"
     )
-    print(f"✅ Report generator configured")
-    print(f"   Path: /medical-consult/report")
-    print()
-
-    print("=" * 60)
-    print("Multi-Agent System Ready!")
-    print()
-    print("When these agents communicate, Helicone will track:")
-    print("  • Hierarchical session tree with 3 agents")
-    print("  • Per-agent costs (filter by 'Agent' property)")
-    print("  • Conversation timeline across agents")
-    print("  • Total session duration and cost")
-    print()
-    print(f"View session trace at:")
-    print(f"https://helicone.ai/dashboard/sessions/{session_id}")
-    print()
-    print("Session tree will look like:")
-    print("  /medical-consult")
-    print("  ├── /triage (triage-agent)")
-    print("  ├── /specialist (specialist-agent)")
-    print("  └── /report (report-generator)")
-    print()
+    sys.stdout.write("\n".join([
+        f"✅ Report generator configured",
+        f"   Path: /medical-consult/report",
+        "",
+        "=" * 60,
+        "Multi-Agent System Ready!",
+        "",
+        "When these agents communicate, Helicone will track:",
+        "  • Hierarchical session tree with 3 agents",
+        "  • Per-agent costs (filter by 'Agent' property)",
+        "  • Conversation timeline across agents",
+        "  • Total session duration and cost",
+        "",
+        f"View session trace at:",
+        f"https://helicone.ai/dashboard/sessions/{session_id}",
+        "",
+        "Session tree will look like:",
+        "  /medical-consult",
+        "  ├── /triage (triage-agent)",
+        "  ├── /specialist (specialist-agent)",
+        "  └── /report (report-generator)",
+        "",
+    ]) + "\n")
 
 
 def simple_autogen_example():
@@ -157,12 +185,6 @@ def main():
 
 if __name__ == "__main__":
     # Check for API keys
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
-
-    if not os.getenv("OPENAI_API_KEY"):
-        print("❌ Error: OPENAI_API_KEY not found")
-        exit(1)
+    require_env("HELICONE_API_KEY", "OPENAI_API_KEY")
 
     main()
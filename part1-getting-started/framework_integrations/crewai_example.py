@@ -10,13 +10,26 @@ This example demonstrates:
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from crewai import LLM
+from functools import lru_cache
 import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.env import require_env
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Headers shared by every agent, built once at import
+_BASE_HEADERS = {
+    "Helicone-Auth": f"Bearer {os.environ.get('HELICONE_API_KEY')}",
+    "Helicone-Property-Framework": "crewai",
+}
+
 
 def create_helicone_crewai_llm(agent_name: str = None, session_id: str = None):
     """
@@ -27,19 +40,22 @@ def create_helicone_crewai_llm(agent_name: str = None, session_id: str = None):
         session_id: Optional session ID for multi-agent tracing
 
     Returns:
-        LLM instance configured with Helicone
+        LLM instance configured with Helicone (shared per agent/session pair)
     """
 
-    headers = {
-        "Helicone-Auth": f"Bearer {os.environ.get('HELICONE_API_KEY')}",
-        "Helicone-Property-Framework": "crewai",
-    }
+    # Pass positionally so f("a") and f(agent_name="a") share one cache entry
+    return _cached_crewai_llm(agent_name, session_id)
 
-    if agent_name:
-        headers["Helicone-Property-Agent"] = agent_name
 
-    if session_id:
-        headers["Helicone-Session-Id"] = session_id
+@lru_cache(maxsize=128)
+def _cached_crewai_llm(agent_name: str, session_id: str):
+    # Imported here so the module loads fast when CrewAI isn't needed yet
+    from crewai import LLM
+
+    headers = _BASE_HEADERS | {
+        **({"Helicone-Property-Agent": agent_name} if agent_name else {}),
+        **({"Helicone-Session-Id": session_id} if session_id else {}),
+    }
 
     llm = LLM(
         model="gpt-4o-mini",
@@ -135,12 +151,6 @@ def main():
 
 if __name__ == "__main__":
     # Check for API keys
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
-
-    if not os.getenv("OPENAI_API_KEY"):
-        print("❌ Error: OPENAI_API_KEY not found")
-        exit(1)
+    require_env("HELICONE_API_KEY", "OPENAI_API_KEY")
 
     main()
@@ -10,15 +10,51 @@ This example demonstrates:
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema.output_parser import StrOutputParser
+from functools import lru_cache
 import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.env import require_env
+from common.display import head
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Headers shared by every chain step, built once at import
+_BASE_HEADERS = {
+    "Helicone-Property-Framework": "langchain",
+}
+
+@lru_cache(maxsize=1)
+def _prompts() -> dict:
+    """Parse the chain's prompt templates once, on first use."""
+
+    # LangChain is imported lazily: it is slow to import and only this
+    # example's functions need it
+    from langchain.prompts import ChatPromptTemplate
+
+    return {
+        "symptoms": ChatPromptTemplate.from_template(
+            "You are a medical assistant. Analyze these symptoms and list possible conditions:\n{symptoms}"
+        ),
+        "drug_check": ChatPromptTemplate.from_template(
+            "List medications commonly used for these symptoms and any notable interactions:\n{symptoms}"
+        ),
+        "history": ChatPromptTemplate.from_template(
+            "List the prior medical history questions a clinician should ask about these symptoms:\n{symptoms}"
+        ),
+        "recommendation": ChatPromptTemplate.from_template(
+            "Based on this medical analysis, provide treatment recommendations:\n{analysis}\n\n"
+            "Medication notes:\n{drug_check}\n\n"
+            "History to confirm:\n{history}"
+        ),
+    }
+
 
 def create_helicone_llm(session_id: str = None, user_id: str = None):
     """
@@ -29,18 +65,23 @@ def create_helicone_llm(session_id: str = None, user_id: str = None):
         user_id: Optional user ID for per-user analytics
 
     Returns:
-        ChatOpenAI instance configured with Helicone
+        ChatOpenAI instance configured with Helicone (shared per
+        session/user pair)
     """
 
-    headers = {
-        "Helicone-Property-Framework": "langchain",
-    }
+    # Pass positionally so f("s") and f(session_id="s") share one cache entry
+    return _cached_llm(session_id, user_id)
+
 
-    if session_id:
-        headers["Helicone-Session-Id"] = session_id
+@lru_cache(maxsize=128)
+def _cached_llm(session_id: str, user_id: str):
+    # Imported here so the module loads fast when LangChain isn't needed yet
+    from langchain_openai import ChatOpenAI
 
-    if user_id:
-        headers["Helicone-User-Id"] = user_id
+    headers = _BASE_HEADERS | {
+        **({"Helicone-Session-Id": session_id} if session_id else {}),
+        **({"Helicone-User-Id": user_id} if user_id else {}),
+    }
 
     llm = ChatOpenAI(
         model="gpt-4o-mini",
@@ -58,6 +99,7 @@ def medical_diagnosis_chain():
 
     Demonstrates:
     - Chaining multiple LLM calls
+    - Fanning out independent steps with RunnableParallel
     - Session tracking across chain steps
     - Automatic cost/latency tracking per step
     """
@@ -68,33 +110,50 @@ def medical_diagnosis_chain():
 
     session_id = "langchain-diagnosis-001"
 
-    # Step 1: Symptom analysis
-    print("Step 1: Analyzing symptoms...")
-    symptom_prompt = ChatPromptTemplate.from_template(
-        "You are a medical assistant. Analyze these symptoms and list possible conditions:\n{symptoms}"
-    )
+    from langchain.schema.output_parser import StrOutputParser
+    from langchain_core.runnables import RunnableParallel
 
-    symptom_llm = create_helicone_llm(session_id=session_id, user_id="doctor-smith")
-    symptom_chain = symptom_prompt | symptom_llm | StrOutputParser()
+    prompts = _prompts()
+
+    # One client for every step: they share the same session and user,
+    # and reusing it keeps a single httpx connection pool
+    llm = create_helicone_llm(session_id=session_id, user_id="doctor-smith")
+
+    # Step 1: Symptom analysis plus independent enrichments, run in parallel
+    print("Step 1: Analyzing symptoms (with drug check and history in parallel)...")
+
+    # Latency becomes the slowest branch instead of the sum of all three
+    enrich = RunnableParallel(
+        analysis=prompts["symptoms"] | llm | StrOutputParser(),
+        drug_check=prompts["drug_check"] | llm | StrOutputParser(),
+        history=prompts["history"] | llm | StrOutputParser(),
+    )
 
     symptoms = "Patient reports: severe headache, fever, stiff neck, sensitivity to light"
-    analysis = symptom_chain.invoke({"symptoms": symptoms})
 
-    print(f"Analysis: {analysis[:200]}...")
+    # Stream the analysis so output starts at the first token; the
+    # enrichment branches are collected in the background
+    print("Analysis: ", end="", flush=True)
+    parts = {"analysis": [], "drug_check": [], "history": []}
+    for chunk in enrich.stream({"symptoms": symptoms}):
+        for key, text in chunk.items():
+            parts[key].append(text)
+            if key == "analysis":
+                print(text, end="", flush=True)
+    findings = {key: "".join(texts) for key, texts in parts.items()}
+
+    print()
+    print(f"Drug check: {head(findings['drug_check'], 200)}")
+    print(f"History: {head(findings['history'], 200)}")
     print()
 
     # Step 2: Recommendation generation
     print("Step 2: Generating recommendations...")
-    recommendation_prompt = ChatPromptTemplate.from_template(
-        "Based on this medical analysis, provide treatment recommendations:\n{analysis}"
-    )
-
-    recommendation_llm = create_helicone_llm(session_id=session_id, user_id="doctor-smith")
-    recommendation_chain = recommendation_prompt | recommendation_llm | StrOutputParser()
+    recommendation_chain = prompts["recommendation"] | llm | StrOutputParser()
 
-    recommendations = recommendation_chain.invoke({"analysis": analysis})
+    recommendations = recommendation_chain.invoke(findings)
 
-    print(f"Recommendations: {recommendations[:200]}...")
+    print(f"Recommendations: {head(recommendations, 200)}")
     print()
 
     print("=" * 60)
@@ -104,7 +163,7 @@ def medical_diagnosis_chain():
     print(f"https://helicone.ai/dashboard/sessions/{session_id}")
     print()
     print("You can see:")
-    print("  • Both LLM calls in the session timeline")
+    print("  • All four LLM calls in the session timeline")
     print("  • Individual costs and latencies per step")
     print("  • Total session cost and duration")
     print("  • Per-user (doctor-smith) analytics")
@@ -141,9 +200,6 @@ def main():
 
 if __name__ == "__main__":
     # Check for API key
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        print("Please create a .env file with your Helicone API key")
-        exit(1)
+    require_env("HELICONE_API_KEY")
 
     main()
@@ -6,26 +6,177 @@ This example demonstrates:
 - Custom property tagging (department, environment)
 - User tracking (per-patient analytics)
 - Prompt versioning for reproducibility
+- Response caching (local LRU, optional semantic, and Helicone edge cache)
 - Full observability: cost, latency, tokens
 
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from openai import OpenAI
-import os
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import tiktoken
+import xxhash
+
+if TYPE_CHECKING:
+    # Only needed by the opt-in semantic cache, which imports them on use
+    import faiss
+    import numpy as np
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.env import require_env
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Initialize with Helicone AI Gateway
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
+client = get_client("https://ai-gateway.helicone.ai")
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0  # Deterministic, so identical requests can hit the cache
+
+SYS_PROMPT = (
+    "You are a medical triage assistant. Classify the urgency "
+    "of patient symptoms as: EMERGENCY, URGENT, STANDARD, or "
+    "LOW-PRIORITY. Provide a brief rationale (2-3 sentences)."
 )
 
+# Static parts of every request, built once at import
+_SYSTEM_MSG = {"role": "system", "content": SYS_PROMPT}
+
+_BASE_HEADERS = {
+    # Custom properties for analytics and filtering
+    "Helicone-Property-App": "triage-assistant",
+    "Helicone-Property-Environment": "production",
+
+    # Associate with a versioned prompt for prompt management
+    "Helicone-Prompt-Id": "triage-classifier-v1",
+
+    # Serve identical symptom reports from Helicone's edge cache for 24 hours
+    "Helicone-Cache-Enabled": "true",
+    "Cache-Control": "max-age=86400",
+}
+
+# Process-local LRU cache of triage results, so repeated symptoms
+# skip the network round-trip entirely
+RESPONSE_CACHE_SIZE = 512
+_response_cache: OrderedDict = OrderedDict()
+
+
+# Optional semantic cache: near-duplicate symptom reports ("SOB" vs
+# "shortness of breath") reuse an earlier answer when their embeddings are
+# close enough. Off by default: negations ("with" vs "without shortness of
+# breath") embed almost identically, so a hit can hand one patient another
+# patient's classification, and every exact miss pays for an extra embedding
+# call before the completion starts.
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_DIM = 1536
+SIMILARITY_THRESHOLD = 0.93
+HNSW_THRESHOLD = 10_000  # Switch to approximate search past this many entries
+
+# One index per department, matching the per-department Helicone-Cache-Seed
+_semantic_indexes: dict[str, "faiss.Index"] = {}
+_semantic_results: dict[str, list[dict]] = {}
+
+
+def cache_key(symptoms: str, department: str) -> int:
+    """Hash everything that determines the model's answer, per department."""
+
+    # Department matches the Helicone-Cache-Seed split, so one department's
+    # answer is never served to another from the local cache either.
+    # Not a security boundary, so a fast non-cryptographic hash is enough;
+    # NUL never shows up in real prompt text, so it is a safe separator
+    return xxhash.xxh3_128(
+        f"{MODEL}\0{SYS_PROMPT}\0{symptoms}\0{TEMPERATURE}\0{department}".encode()
+    ).intdigest()
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    # Built on first use rather than at import: encoding_for_model may have
+    # to download the BPE file. The system prompt never changes, so its
+    # token count is computed once alongside it.
+    enc = tiktoken.encoding_for_model(MODEL)
+    return enc, len(enc.encode(SYS_PROMPT))
+
+
+def estimate_prompt_tokens(symptoms: str) -> int:
+    """
+    Estimate input tokens for a triage request (used when the stream reports no usage).
+
+    Only the user message is tokenized per call; the system prompt's count
+    is computed once.
+    """
+
+    enc, sys_tokens = _encoder()
+    return sys_tokens + len(enc.encode(f"Patient symptoms: {symptoms}"))
+
+
+def embed(text: str) -> "np.ndarray":
+    """Embed text as a unit-length float32 row, so inner product = cosine."""
+
+    response = client.embeddings.create(model=EMBED_MODEL, input=text)
+    # Imported here so the default (non-semantic) path never loads faiss/numpy
+    import faiss
+    import numpy as np
+
+    vector = np.array([response.data[0].embedding], dtype="float32")
+    faiss.normalize_L2(vector)
+    return vector
+
+
+def semantic_lookup(vector: "np.ndarray", department: str):
+    """Return the department's cached result closest to vector, or None below the threshold."""
+
+    index = _semantic_indexes.get(department)
+    if index is None or index.ntotal == 0:
+        return None
 
-def triage_patient(patient_id: str, symptoms: str, department: str) -> dict:
+    scores, ids = index.search(vector, 1)
+    if scores[0, 0] > SIMILARITY_THRESHOLD:
+        return _semantic_results[department][ids[0, 0]]
+    return None
+
+
+def semantic_store(vector: "np.ndarray", result: dict, department: str) -> None:
+    """Add a result to the department's semantic cache, moving to HNSW once it grows large."""
+
+    import faiss
+
+    index = _semantic_indexes.get(department)
+    if index is None:
+        index = _semantic_indexes[department] = faiss.IndexFlatIP(EMBED_DIM)
+        _semantic_results[department] = []
+
+    index.add(vector)
+    _semantic_results[department].append(result)
+
+    if isinstance(index, faiss.IndexFlatIP) and index.ntotal > HNSW_THRESHOLD:
+        hnsw = faiss.IndexHNSWFlat(EMBED_DIM, 32, faiss.METRIC_INNER_PRODUCT)
+        hnsw.add(index.reconstruct_n(0, index.ntotal))
+        _semantic_indexes[department] = hnsw
+
+
+def _remember(key: int, result: dict) -> None:
+    _response_cache[key] = result
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def triage_patient(
+    patient_id: str,
+    symptoms: str,
+    department: str,
+    echo: bool = False,
+    semantic_cache: bool = False,
+) -> dict:
     """
     Classify patient symptoms using LLM with full Helicone observability.
 
@@ -33,59 +184,122 @@ def triage_patient(patient_id: str, symptoms: str, department: str) -> dict:
         patient_id: Unique patient identifier
         symptoms: Patient-reported symptoms
         department: Hospital department (cardiology, emergency, etc.)
+        echo: Write the classification to stdout as it streams in
+        semantic_cache: Also reuse answers for near-duplicate symptoms
+            (see the caveats above SIMILARITY_THRESHOLD)
 
     Returns:
         dict with classification, rationale, and metadata
     """
 
+    key = cache_key(symptoms, department)
+
+    vector = None
+    cached = _response_cache.get(key)
+    if cached is not None:
+        _response_cache.move_to_end(key)
+    elif semantic_cache:
+        # Exact miss: try a near-duplicate before paying for a completion
+        vector = embed(symptoms)
+        cached = semantic_lookup(vector, department)
+        if cached is not None:
+            _remember(key, cached)
+
+    if cached is not None:
+        # Cache hit: no completion is requested, so nothing new is logged in
+        # Helicone and this call used no tokens
+        if echo:
+            sys.stdout.write(cached["classification"])
+            sys.stdout.flush()
+        return {
+            **cached,
+            "tokens_used": {"input": 0, "output": 0, "total": 0},
+            "patient_id": patient_id,
+            "department": department,
+        }
+
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a medical triage assistant. Classify the urgency "
-                    "of patient symptoms as: EMERGENCY, URGENT, STANDARD, or "
-                    "LOW-PRIORITY. Provide a brief rationale (2-3 sentences)."
-                ),
-            },
-            {
-                "role": "user",
-                "content": f"Patient symptoms: {symptoms}"
-            },
+            _SYSTEM_MSG,
+            {"role": "user", "content": f"Patient symptoms: {symptoms}"},
         ],
         max_tokens=200,
-        temperature=0.1,  # Low temperature for consistent triage decisions
+        temperature=TEMPERATURE,
+        # Stream so the first tokens show up without waiting for the full reply
+        stream=True,
+        stream_options={"include_usage": True},
         extra_headers={
+            **_BASE_HEADERS,
+
             # Track which user (patient) this request is for
             "Helicone-User-Id": patient_id,
-
-            # Custom properties for analytics and filtering
             "Helicone-Property-Department": department,
-            "Helicone-Property-App": "triage-assistant",
-            "Helicone-Property-Environment": "production",
 
-            # Associate with a versioned prompt for prompt management
-            "Helicone-Prompt-Id": "triage-classifier-v1",
+            # Separate cache namespace per department
+            "Helicone-Cache-Seed": department,
         },
     )
 
-    # Extract response content
-    classification = response.choices[0].message.content
+    parts = []
+    usage = None
+    model = MODEL
 
-    # Calculate metrics (these are automatically logged by Helicone)
-    usage = response.usage
+    for chunk in response:
+        model = chunk.model or model
 
-    return {
-        "classification": classification,
-        "patient_id": patient_id,
-        "department": department,
-        "tokens_used": {
+        # The final chunk carries no choices, only token usage
+        if chunk.usage is not None:
+            usage = chunk.usage
+
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if echo:
+                    sys.stdout.write(delta)
+                    sys.stdout.flush()
+
+    classification = "".join(parts)
+
+    if usage is not None:
+        tokens_used = {
             "input": usage.prompt_tokens,
             "output": usage.completion_tokens,
             "total": usage.total_tokens,
-        },
-        "model": response.model,
+        }
+    else:
+        # No usage chunk (interrupted stream, or a provider that ignores
+        # include_usage): fall back to local estimates
+        try:
+            prompt_tokens = estimate_prompt_tokens(symptoms)
+            output_tokens = len(_encoder()[0].encode(classification))
+            tokens_used = {
+                "input": prompt_tokens,
+                "output": output_tokens,
+                "total": prompt_tokens + output_tokens,
+            }
+        except Exception:
+            # The encoder couldn't be loaded (e.g. the BPE download failed);
+            # the classification itself is still valid
+            tokens_used = {"input": None, "output": None, "total": None}
+
+    result = {
+        "classification": classification,
+        "tokens_used": tokens_used,
+        "model": model,
+    }
+
+    _remember(key, result)
+    if vector is not None:
+        semantic_store(vector, result, department)
+
+    # Copy the nested dict too, so callers can't mutate the cached entry
+    return {
+        **result,
+        "tokens_used": dict(result["tokens_used"]),
+        "patient_id": patient_id,
+        "department": department,
     }
 
 
@@ -99,46 +313,52 @@ def main():
     # Example 1: Emergency case
     print("Example 1: EMERGENCY CASE")
     print("-" * 60)
+    print("Classification:")
     result = triage_patient(
         patient_id="patient-7829",
         symptoms="Severe chest pain, shortness of breath, sweating, radiating pain to left arm",
-        department="cardiology"
+        department="cardiology",
+        echo=True,
     )
+    print("\n")
     print(f"Patient ID: {result['patient_id']}")
     print(f"Department: {result['department']}")
     print(f"Model: {result['model']}")
     print(f"Tokens: {result['tokens_used']['total']} (in: {result['tokens_used']['input']}, out: {result['tokens_used']['output']})")
-    print(f"\nClassification:\n{result['classification']}")
     print()
 
     # Example 2: Routine case
     print("Example 2: ROUTINE CASE")
     print("-" * 60)
+    print("Classification:")
     result = triage_patient(
         patient_id="patient-3421",
         symptoms="Mild headache for 2 days, no fever, no visual disturbances",
-        department="general-practice"
+        department="general-practice",
+        echo=True,
     )
+    print("\n")
     print(f"Patient ID: {result['patient_id']}")
     print(f"Department: {result['department']}")
     print(f"Model: {result['model']}")
     print(f"Tokens: {result['tokens_used']['total']} (in: {result['tokens_used']['input']}, out: {result['tokens_used']['output']})")
-    print(f"\nClassification:\n{result['classification']}")
     print()
 
     # Example 3: Urgent case
     print("Example 3: URGENT CASE")
     print("-" * 60)
+    print("Classification:")
     result = triage_patient(
         patient_id="patient-5612",
         symptoms="High fever (103°F), persistent cough for 5 days, difficulty breathing",
-        department="respiratory"
+        department="respiratory",
+        echo=True,
     )
+    print("\n")
     print(f"Patient ID: {result['patient_id']}")
     print(f"Department: {result['department']}")
     print(f"Model: {result['model']}")
     print(f"Tokens: {result['tokens_used']['total']} (in: {result['tokens_used']['input']}, out: {result['tokens_used']['output']})")
-    print(f"\nClassification:\n{result['classification']}")
     print()
 
     print("=" * 60)
@@ -155,10 +375,6 @@ def main():
 
 if __name__ == "__main__":
     # Check for API key
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found in environment variables")
-        print("Please create a .env file with your Helicone API key")
-        print("See .env.example for template")
-        exit(1)
+    require_env("HELICONE_API_KEY")
 
     main()
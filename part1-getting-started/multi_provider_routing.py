@@ -10,18 +10,22 @@ This example demonstrates:
 Part of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from openai import OpenAI
-import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.env import require_env
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Single client works for ALL providers via AI Gateway
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client("https://ai-gateway.helicone.ai")
 
 
 def ask_question(model: str, question: str) -> dict:
@@ -78,24 +82,32 @@ def main():
 
     results = []
 
-    for model, provider_name in providers:
-        print(f"Testing: {provider_name} ({model})")
-        print("-" * 70)
+    # Fire all providers at once: wall time is the slowest provider, not the sum
+    with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+        futures = {
+            executor.submit(ask_question, model, question): (model, provider_name)
+            for model, provider_name in providers
+        }
+
+        for future in as_completed(futures):
+            model, provider_name = futures[future]
+            print(f"Testing: {provider_name} ({model})")
+            print("-" * 70)
 
-        try:
-            result = ask_question(model, question)
-            results.append((provider_name, result))
+            try:
+                result = future.result()
+                results.append((provider_name, result))
 
-            print(f"Model: {result['model']}")
-            print(f"Tokens: {result['tokens']['total']} (in: {result['tokens']['input']}, out: {result['tokens']['output']})")
-            print(f"\nResponse:\n{result['response']}")
-            print()
+                print(f"Model: {result['model']}")
+                print(f"Tokens: {result['tokens']['total']} (in: {result['tokens']['input']}, out: {result['tokens']['output']})")
+                print(f"\nResponse:\n{result['response']}")
+                print()
 
-        except Exception as e:
-            print(f"❌ Error with {provider_name}: {e}")
-            print("Note: Make sure provider keys are configured in Helicone dashboard")
-            print("https://helicone.ai/dashboard/developer/provider-keys")
-            print()
+            except Exception as e:
+                print(f"❌ Error with {provider_name}: {e}")
+                print("Note: Make sure provider keys are configured in Helicone dashboard")
+                print("https://helicone.ai/dashboard/developer/provider-keys")
+                print()
 
     print("=" * 70)
     print("✅ Multi-provider routing complete!")
@@ -113,9 +125,6 @@ def main():
 
 if __name__ == "__main__":
     # Check for API key
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        print("Please create a .env file with your Helicone API key")
-        exit(1)
+    require_env("HELICONE_API_KEY")
 
     main()
@@ -9,16 +9,20 @@ Demonstrates:
 Part 2 of the Helicone tutorial series
 """
 
-from openai import OpenAI
-import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.env import require_env
+from common.display import head
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client("https://ai-gateway.helicone.ai")
 
 
 def basic_caching_example():
@@ -37,7 +41,7 @@ def basic_caching_example():
         }
     )
 
-    print(f"Response: {response.choices[0].message.content[:100]}...")
+    print(f"Response: {head(response.choices[0].message.content)}")
     print(f"Cache Status: {response.headers.get('Helicone-Cache', 'MISS')}")
     print("\nRun again within 24 hours to see CACHE HIT")
     print()
@@ -60,7 +64,7 @@ def bucket_caching_example():
         }
     )
 
-    print(f"Response: {response.choices[0].message.content[:100]}...")
+    print(f"Response: {head(response.choices[0].message.content)}")
     print("Bucket caching stores 5 variations, returns random on hit")
     print()
 
@@ -84,15 +88,13 @@ def cache_seed_example():
         }
     )
 
-    print(f"Response for {user_id}: {response.choices[0].message.content[:80]}...")
+    print(f"Response for {user_id}: {head(response.choices[0].message.content, 80)}")
     print("Each user gets their own cached responses")
     print()
 
 
 if __name__ == "__main__":
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
+    require_env("HELICONE_API_KEY")
 
     basic_caching_example()
     bucket_caching_example()
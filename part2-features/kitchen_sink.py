@@ -4,16 +4,39 @@ Kitchen Sink Example - All Features Combined
 Demonstrates using multiple Helicone features in a single request
 """
 
-from openai import OpenAI
-import os
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.rate_limit import POLICY_HEADER, POLICY_USER_HOURLY
+from common.display import head
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client()
+
+# Everything except the session and user IDs is the same on every request,
+# so the static headers are built once and merged in at the call site
+_BASE_HEADERS = MappingProxyType({
+    # Custom properties
+    "Helicone-Property-Environment": "demo",
+    "Helicone-Property-Feature": "kitchen-sink",
+
+    # Caching
+    "Helicone-Cache-Enabled": "true",
+    "Cache-Control": "max-age=3600",
+
+    # Rate limiting
+    POLICY_HEADER: POLICY_USER_HOURLY.header,  # "100;w=3600;s=user"
+
+    # Prompt versioning
+    "Helicone-Prompt-Id": "diabetes-query-v1",
+})
 
 response = client.chat.completions.create(
     model="gpt-4o-mini",
@@ -21,31 +44,19 @@ response = client.chat.completions.create(
     max_tokens=200,
     temperature=0,
     extra_headers={
+        **_BASE_HEADERS,
+
         # Session tracing
         "Helicone-Session-Id": "kitchen-sink-001",
         "Helicone-Session-Path": "/demo",
-        
+
         # User tracking
         "Helicone-User-Id": "demo-user",
-        
-        # Custom properties
-        "Helicone-Property-Environment": "demo",
-        "Helicone-Property-Feature": "kitchen-sink",
-        
-        # Caching
-        "Helicone-Cache-Enabled": "true",
-        "Cache-Control": "max-age=3600",
-        
-        # Rate limiting
-        "Helicone-RateLimit-Policy": "100;w=3600;s=user",
-        
-        # Prompt versioning
-        "Helicone-Prompt-Id": "diabetes-query-v1",
     }
 )
 
 print("✅ Request with ALL features enabled!")
-print(f"Response: {response.choices[0].message.content[:100]}...")
+print(f"Response: {head(response.choices[0].message.content)}")
 print("\nFeatures active:")
 print("  ✓ Session tracing")
 print("  ✓ User tracking") 
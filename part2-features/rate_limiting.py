@@ -10,110 +10,140 @@ Demonstrates:
 Part 2 of the Helicone tutorial series
 """
 
-from openai import OpenAI
-import os
+import asyncio
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_async_client
+from common.rate_limit import (
+    POLICY_HEADER,
+    POLICY_USER_DAILY_BUDGET,
+    Policy,
+    limited_create,
+)
+from common.env import require_env
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+# The examples only read response headers, so they request raw responses
+# and the body is never parsed into a ChatCompletion
+client = get_async_client()
+
+# Policies are built once; .header is the string Helicone expects
+GLOBAL_HOURLY = Policy(1000, 3600)  # "1000;w=3600"
+USER_DAILY = Policy(100, 86400, segment="user")  # "100;w=86400;s=user"
+DEPARTMENT_HOURLY = Policy(5000, 3600, segment="property")  # "5000;w=3600;s=property"
 
 
-def global_rate_limit():
+async def global_rate_limit():
     """Global limit: 1000 requests per hour"""
-    print("Example 1: Global Rate Limit")
-    print("=" * 60)
 
-    response = client.chat.completions.create(
+    raw = await limited_create(
+        client.chat.completions.with_raw_response.create,
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": "Test message"}],
-        max_tokens=50,
+        max_tokens=1,  # Only the rate-limit headers are read
         extra_headers={
-            "Helicone-RateLimit-Policy": "1000;w=3600",  # 1000 req/hour
+            POLICY_HEADER: GLOBAL_HOURLY.header,  # 1000 req/hour
         }
     )
 
-    remaining = response.headers.get("Helicone-RateLimit-Remaining", "N/A")
+    print("Example 1: Global Rate Limit")
+    print("=" * 60)
+    remaining = raw.headers.get("Helicone-RateLimit-Remaining", "N/A")
     print(f"Remaining requests: {remaining}")
     print()
 
 
-def per_user_rate_limit():
+async def per_user_rate_limit():
     """Per-user limit: 100 requests per day"""
-    print("Example 2: Per-User Rate Limit")
-    print("=" * 60)
 
     user_id = "user-456"
 
-    response = client.chat.completions.create(
+    raw = await limited_create(
+        client.chat.completions.with_raw_response.create,
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": "User-specific query"}],
-        max_tokens=50,
+        max_tokens=1,  # Only the rate-limit headers are read
         extra_headers={
-            "Helicone-RateLimit-Policy": "100;w=86400;s=user",  # 100/day per user
+            POLICY_HEADER: USER_DAILY.header,  # 100/day per user
             "Helicone-User-Id": user_id,
         }
     )
 
-    remaining = response.headers.get("Helicone-RateLimit-Remaining", "N/A")
+    print("Example 2: Per-User Rate Limit")
+    print("=" * 60)
+    remaining = raw.headers.get("Helicone-RateLimit-Remaining", "N/A")
     print(f"User {user_id} remaining: {remaining}")
     print()
 
 
-def cost_based_rate_limit():
+async def cost_based_rate_limit():
     """Cost-based limit: $5 per day per user"""
-    print("Example 3: Cost-Based Rate Limit ($5/day)")
-    print("=" * 60)
 
     user_id = "user-789"
 
-    response = client.chat.completions.create(
+    raw = await limited_create(
+        client.chat.completions.with_raw_response.create,
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": "Another query"}],
-        max_tokens=50,
+        max_tokens=1,  # Only the rate-limit headers are read
+        # Cents policy: the local check only blocks once the budget is spent.
+        # This probe never parses usage, so it isn't charged locally; Helicone
+        # still counts it server-side
         extra_headers={
-            "Helicone-RateLimit-Policy": "500;w=86400;u=cents;s=user",  # $5/day
+            POLICY_HEADER: POLICY_USER_DAILY_BUDGET.header,  # $5/day
             "Helicone-User-Id": user_id,
         }
     )
 
-    remaining_cents = response.headers.get("Helicone-RateLimit-Remaining", "N/A")
+    print("Example 3: Cost-Based Rate Limit ($5/day)")
+    print("=" * 60)
+    remaining_cents = raw.headers.get("Helicone-RateLimit-Remaining", "N/A")
     print(f"User {user_id} budget remaining: {remaining_cents} cents")
     print()
 
 
-def department_rate_limit():
+async def department_rate_limit():
     """Per-department limit: 5000 requests per hour"""
-    print("Example 4: Department Rate Limit")
-    print("=" * 60)
 
-    response = client.chat.completions.create(
+    raw = await limited_create(
+        client.chat.completions.with_raw_response.create,
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": "Department query"}],
-        max_tokens=50,
+        max_tokens=1,  # Only the rate-limit headers are read
         extra_headers={
-            "Helicone-RateLimit-Policy": "5000;w=3600;s=property",
+            POLICY_HEADER: DEPARTMENT_HOURLY.header,
             "Helicone-Property-Department": "cardiology",
         }
     )
 
-    remaining = response.headers.get("Helicone-RateLimit-Remaining", "N/A")
+    print("Example 4: Department Rate Limit")
+    print("=" * 60)
+    remaining = raw.headers.get("Helicone-RateLimit-Remaining", "N/A")
     print(f"Cardiology dept remaining: {remaining}")
     print()
 
 
+async def run_all():
+    """Run every example concurrently over the shared client."""
+    await asyncio.gather(
+        global_rate_limit(),
+        per_user_rate_limit(),
+        cost_based_rate_limit(),
+        department_rate_limit(),
+    )
+
+
 if __name__ == "__main__":
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
-
-    global_rate_limit()
-    per_user_rate_limit()
-    cost_based_rate_limit()
-    department_rate_limit()
+    require_env("HELICONE_API_KEY")
+
+    # The four policies are independent, so fire all requests at once
+    asyncio.run(run_all())
 
     print("✅ All rate limiting examples complete!")
     print("\nRate Limit Policy Syntax:")
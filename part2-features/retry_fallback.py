@@ -1,32 +1,68 @@
 """
 Retry and Fallback Examples
 
-Demonstrates automatic retries with exponential backoff and provider fallbacks
+Demonstrates client-side retries with jittered exponential backoff and provider fallbacks
 """
 
-from openai import OpenAI
-import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import openai
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
+# Retries happen in with_retry(), so the SDK's own retries are turned off
+# to avoid stacking two retry loops on the same failure.
+#
+# with_retry() also replaces Helicone's gateway retries here: this example
+# sends no Helicone-Retry-* headers. To retry in the gateway instead, drop
+# with_retry() and send "Helicone-Retry-Enabled"/"-Num"/"-Factor" as
+# production_checklist.py does; don't use both.
+client = get_client().with_options(max_retries=0)
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
 )
 
-# Example: Retry with exponential backoff + provider fallback
-response = client.chat.completions.create(
+
+def with_retry(fn, *, tries=3, base=1.0, factor=2.0, jitter=0.25):
+    """
+    Call fn(), retrying transient failures with jittered exponential backoff.
+
+    Each delay is base * factor**attempt, randomized by +/- jitter (1s, 2s, ...
+    +/- 25% by default), so many clients failing together don't all retry
+    at the same instant.
+    """
+
+    for attempt in range(tries):
+        try:
+            return fn()
+        except RETRYABLE_ERRORS:
+            if attempt == tries - 1:
+                raise
+            time.sleep(base * factor ** attempt * (1 + random.uniform(-jitter, jitter)))
+
+
+# Example: Retry with jittered exponential backoff + provider fallback
+response = with_retry(lambda: client.chat.completions.create(
     model="gpt-4o/claude-sonnet-4",  # Try GPT-4o, fallback to Claude
     messages=[{"role": "user", "content": "Critical query with fallback"}],
     max_tokens=100,
     extra_headers={
-        "Helicone-Retry-Enabled": "true",
-        "Helicone-Retry-Num": "3",
-        "Helicone-Retry-Factor": "2",  # Exponential: 1s, 2s, 4s
         "Helicone-Fallback-Enabled": "true",
     }
-)
+))
 
 print("✅ Request succeeded (possibly after retries/fallback)")
 print(f"Model used: {response.model}")
@@ -10,19 +10,40 @@ This example demonstrates:
 Part 2 of the Helicone tutorial series: https://zubairashfaque.github.io/
 """
 
-from openai import OpenAI
-import os
+import asyncio
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_async_client
+from common.helicone_headers import (
+    H_SESSION_ID,
+    H_SESSION_PATH,
+    H_SESSION_NAME,
+    H_USER_ID,
+    H_AGENT,
+)
+from common.env import require_env
+from common.display import head, quiet
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_async_client()
+
+# USD per token (input list price), used for the per-agent cost estimate
+PRICE_PER_TOKEN = {
+    "gpt-4o-mini": 1.5e-7,
+    "gpt-4o": 2.5e-6,
+}
+
+
+COHORT_CONCURRENCY = 32  # Patients in flight at once
 
 
-def multi_agent_healthcare_workflow(patient_id: str, symptoms: str):
+async def multi_agent_healthcare_workflow(patient_id: str, symptoms: str, verbose: bool = True):
     """
     Demonstrate multi-agent workflow with hierarchical session tracing.
 
@@ -31,16 +52,29 @@ def multi_agent_healthcare_workflow(patient_id: str, symptoms: str):
     2. Analysis agent (child) - Detailed analysis
     3. Lab review agent (grandchild) - Lab data review
     4. Report generator (child) - Final report
+
+    Steps 3 and 4 both depend only on earlier results, so they run concurrently.
+
+    Args:
+        patient_id: Unique patient identifier
+        symptoms: Patient-reported symptoms
+        verbose: Print each step (turned off when running a cohort)
+
+    Returns:
+        dict with patient_id, session_id, report, and total_cost
     """
 
+    echo = print if verbose else quiet
+
     session_id = f"healthcare-session-{patient_id}"
+    total_cost = 0.0
 
-    print(f"Starting multi-agent workflow for patient {patient_id}")
-    print("=" * 70)
+    echo(f"Starting multi-agent workflow for patient {patient_id}")
+    echo("=" * 70)
 
     # Step 1: Triage Agent (Root)
-    print("\n[1/4] Triage Agent - Initial Assessment")
-    triage_response = client.chat.completions.create(
+    echo("\n[1/4] Triage Agent - Initial Assessment")
+    triage_response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a triage nurse. Assess urgency level."},
@@ -48,21 +82,23 @@ def multi_agent_healthcare_workflow(patient_id: str, symptoms: str):
         ],
         max_tokens=150,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage",
-            "Helicone-Session-Name": "Healthcare Multi-Agent Workflow",
-            "Helicone-Property-Agent": "triage",
-            "Helicone-User-Id": patient_id,
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage",
+            H_SESSION_NAME: "Healthcare Multi-Agent Workflow",
+            H_AGENT: "triage",
+            H_USER_ID: patient_id,
         }
     )
 
     triage_result = triage_response.choices[0].message.content
-    print(f"Triage: {triage_result[:100]}...")
-    print(f"Cost: ${triage_response.usage.total_tokens * 0.00015 / 1000:.6f}")
+    echo(f"Triage: {head(triage_result)}")
+    cost = PRICE_PER_TOKEN["gpt-4o-mini"] * triage_response.usage.total_tokens
+    total_cost += cost
+    echo(f"Cost: ${cost:.6f}")
 
     # Step 2: Analysis Agent (Child of triage)
-    print("\n[2/4] Analysis Agent - Detailed Analysis")
-    analysis_response = client.chat.completions.create(
+    echo("\n[2/4] Analysis Agent - Detailed Analysis")
+    analysis_response = await client.chat.completions.create(
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "You are a diagnostic specialist. Provide detailed analysis."},
@@ -70,85 +106,139 @@ def multi_agent_healthcare_workflow(patient_id: str, symptoms: str):
         ],
         max_tokens=300,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/analysis",  # Child of /triage
-            "Helicone-Property-Agent": "analysis",
-            "Helicone-User-Id": patient_id,
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage/analysis",  # Child of /triage
+            H_AGENT: "analysis",
+            H_USER_ID: patient_id,
         }
     )
 
     analysis_result = analysis_response.choices[0].message.content
-    print(f"Analysis: {analysis_result[:100]}...")
-    print(f"Cost: ${analysis_response.usage.total_tokens * 0.0025 / 1000:.6f}")
-
-    # Step 3: Lab Review Agent (Grandchild - child of analysis)
-    print("\n[3/4] Lab Review Agent - Lab Data Analysis")
-    lab_response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a lab data analyst. Review hypothetical lab results."},
-            {"role": "user", "content": "Review lab results for the analysis above."}
-        ],
-        max_tokens=200,
-        extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/analysis/lab-review",  # Grandchild
-            "Helicone-Property-Agent": "lab-review",
-            "Helicone-User-Id": patient_id,
-        }
+    echo(f"Analysis: {head(analysis_result)}")
+    cost = PRICE_PER_TOKEN["gpt-4o"] * analysis_response.usage.total_tokens
+    total_cost += cost
+    echo(f"Cost: ${cost:.6f}")
+
+    # Steps 3 + 4 are siblings in the dependency graph: run them concurrently
+    echo("\n[3/4] Lab Review Agent + [4/4] Report Generator (in parallel)")
+    lab_response, report_response = await asyncio.gather(
+        # Step 3: Lab Review Agent (Grandchild - child of analysis)
+        client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are a lab data analyst. Review hypothetical lab results."},
+                {"role": "user", "content": "Review lab results for the analysis above."}
+            ],
+            max_tokens=200,
+            extra_headers={
+                H_SESSION_ID: session_id,
+                H_SESSION_PATH: "/triage/analysis/lab-review",  # Grandchild
+                H_AGENT: "lab-review",
+                H_USER_ID: patient_id,
+            }
+        ),
+        # Step 4: Report Generator (Child of triage, sibling of analysis)
+        client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "Generate a concise medical report."},
+                {"role": "user", "content": f"Compile: Triage={triage_result}, Analysis={analysis_result}"}
+            ],
+            max_tokens=200,
+            extra_headers={
+                H_SESSION_ID: session_id,
+                H_SESSION_PATH: "/triage/report",  # Sibling of /analysis
+                H_AGENT: "report-generator",
+                H_USER_ID: patient_id,
+            }
+        ),
     )
 
     lab_result = lab_response.choices[0].message.content
-    print(f"Lab Review: {lab_result[:100]}...")
-    print(f"Cost: ${lab_response.usage.total_tokens * 0.0025 / 1000:.6f}")
-
-    # Step 4: Report Generator (Child of triage, sibling of analysis)
-    print("\n[4/4] Report Generator - Final Report")
-    report_response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "Generate a concise medical report."},
-            {"role": "user", "content": f"Compile: Triage={triage_result}, Analysis={analysis_result}"}
-        ],
-        max_tokens=200,
-        extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/report",  # Sibling of /analysis
-            "Helicone-Property-Agent": "report-generator",
-            "Helicone-User-Id": patient_id,
-        }
-    )
+    echo(f"Lab Review: {head(lab_result)}")
+    cost = PRICE_PER_TOKEN["gpt-4o"] * lab_response.usage.total_tokens
+    total_cost += cost
+    echo(f"Cost: ${cost:.6f}")
 
     report_result = report_response.choices[0].message.content
-    print(f"Report: {report_result[:100]}...")
-    print(f"Cost: ${report_response.usage.total_tokens * 0.00015 / 1000:.6f}")
-
-    # Calculate total cost
-    total_cost = (
-        triage_response.usage.total_tokens * 0.00015 / 1000 +
-        analysis_response.usage.total_tokens * 0.0025 / 1000 +
-        lab_response.usage.total_tokens * 0.0025 / 1000 +
-        report_response.usage.total_tokens * 0.00015 / 1000
-    )
+    echo(f"Report: {head(report_result)}")
+    cost = PRICE_PER_TOKEN["gpt-4o-mini"] * report_response.usage.total_tokens
+    total_cost += cost
+    echo(f"Cost: ${cost:.6f}")
+
+    echo("\n" + "=" * 70)
+    echo(f"✅ Workflow Complete!")
+    echo(f"Total Cost: ${total_cost:.6f}")
+    echo(f"\nView session tree in Helicone:")
+    echo(f"https://helicone.ai/dashboard/sessions/{session_id}")
+    echo("\nSession hierarchy:")
+    echo("  /triage (root)")
+    echo("  ├── /triage/analysis")
+    echo("  │   └── /triage/analysis/lab-review")
+    echo("  └── /triage/report")
+
+    return {
+        "patient_id": patient_id,
+        "session_id": session_id,
+        "report": report_result,
+        "total_cost": total_cost,
+    }
+
+
+async def run_cohort(patients: list[tuple[str, str]], concurrency: int = COHORT_CONCURRENCY):
+    """
+    Run the workflow for many patients concurrently, yielding results as they finish.
 
-    print("\n" + "=" * 70)
-    print(f"✅ Workflow Complete!")
-    print(f"Total Cost: ${total_cost:.6f}")
-    print(f"\nView session tree in Helicone:")
-    print(f"https://helicone.ai/dashboard/sessions/{session_id}")
-    print("\nSession hierarchy:")
-    print("  /triage (root)")
-    print("  ├── /triage/analysis")
-    print("  │   └── /triage/analysis/lab-review")
-    print("  └── /triage/report")
+    A semaphore caps how many patients are in flight, so a large cohort doesn't
+    open more connections than the client's pool holds or flood the gateway.
+    A patient whose workflow fails yields {"patient_id", "error"} instead of
+    stopping the rest of the cohort.
 
+    Args:
+        patients: (patient_id, symptoms) pairs
+        concurrency: Most workflows running at once
+    """
 
-if __name__ == "__main__":
-    if not os.getenv("HELICONE_API_KEY"):
-        print("❌ Error: HELICONE_API_KEY not found")
-        exit(1)
+    sem = asyncio.Semaphore(concurrency)
 
-    multi_agent_healthcare_workflow(
-        patient_id="patient-9876",
-        symptoms="Persistent fever, cough, fatigue for 5 days"
-    )
+    async def run_one(patient_id, symptoms):
+        async with sem:
+            try:
+                return await multi_agent_healthcare_workflow(patient_id, symptoms, verbose=False)
+            except Exception as e:
+                return {"patient_id": patient_id, "error": e}
+
+    for future in asyncio.as_completed([run_one(p, s) for p, s in patients]):
+        yield await future
+
+
+async def cohort_demo():
+    """Run a small sample cohort and print one line per patient as it completes."""
+
+    patients = [
+        ("patient-9876", "Persistent fever, cough, fatigue for 5 days"),
+        ("patient-5432", "Sudden severe headache, stiff neck, sensitivity to light"),
+        ("patient-2468", "Mild sore throat and runny nose for 2 days"),
+    ]
+
+    total = 0.0
+    async for result in run_cohort(patients):
+        if "error" in result:
+            print(f"{result['patient_id']}: ❌ {result['error']}")
+            continue
+        total += result["total_cost"]
+        print(f"{result['patient_id']}: ${result['total_cost']:.6f} (session {result['session_id']})")
+    print(f"Cohort cost: ${total:.6f}")
+
+
+if __name__ == "__main__":
+    require_env("HELICONE_API_KEY")
+
+    # Pass --cohort to run several patients concurrently instead
+    if "--cohort" in sys.argv:
+        asyncio.run(cohort_demo())
+    else:
+        asyncio.run(multi_agent_healthcare_workflow(
+            patient_id="patient-9876",
+            symptoms="Persistent fever, cough, fatigue for 5 days"
+        ))
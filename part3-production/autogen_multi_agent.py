@@ -10,40 +10,96 @@ Demonstrates production-grade multi-agent workflow:
 Full Helicone instrumentation with session tracing and cost attribution.
 """
 
-from openai import OpenAI
-import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.helicone_headers import (
+    H_SESSION_ID,
+    H_SESSION_PATH,
+    H_USER_ID,
+    H_AGENT,
+    H_DEPARTMENT,
+    H_CACHE_ENABLED,
+    H_CACHE_CONTROL,
+)
+from common.display import head, quiet
 from dotenv import load_dotenv
-import uuid
+import secrets
 
 load_dotenv()
 
 # Initialize Helicone-enabled client
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client()
+
+# Case-insensitive scan without allocating an upper-cased copy of the response
+_EMERGENCY_RE = re.compile(r"EMERGENCY", re.IGNORECASE)
+# The triage label as a whole word at the start of the reply (ignoring
+# leading punctuation/markdown); the lookahead waits for the word to end
+_LABEL_RE = re.compile(r"\W*(EMERGENCY|ROUTINE)(?=\W)", re.IGNORECASE)
+_LABEL_WINDOW = 32  # Characters of the reply that may precede/contain the label
+
+COHORT_WORKERS = 32  # Patients in flight at once
 
 def triage_agent(patient_symptoms, session_id, patient_id):
     """Agent 1: Triage - Assess severity and route to appropriate specialist"""
+    # Trade-off: routing only needs the label, so the prompt puts it first and
+    # the stream is closed as soon as it arrives. That saves up to ~150 output
+    # tokens, but the specialists no longer see a triage rationale (they get
+    # the label plus the patient's own report instead), and Helicone may not
+    # cache an aborted stream, so repeat cases can still pay for the first
+    # few tokens.
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
-            {"role": "system", "content": "You are a medical triage nurse. Assess symptom severity and classify as EMERGENCY or ROUTINE."},
+            {"role": "system", "content": "You are a medical triage nurse. Assess symptom severity. Start your reply with exactly one word, EMERGENCY or ROUTINE, then give a brief rationale."},
             {"role": "user", "content": f"Patient reports: {patient_symptoms}"}
         ],
         max_tokens=150,
         temperature=0,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage",
-            "Helicone-Property-Agent": "triage",
-            "Helicone-Property-Department": "emergency-dept",
-            "Helicone-User-Id": patient_id,
-            "Helicone-Cache-Enabled": "true",
-            "Cache-Control": "max-age=3600",
-        }
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage",
+            H_AGENT: "triage",
+            H_DEPARTMENT: "emergency-dept",
+            H_USER_ID: patient_id,
+            H_CACHE_ENABLED: "true",
+            H_CACHE_CONTROL: "max-age=3600",
+        },
+        stream=True,
     )
-    return response.choices[0].message.content
+
+    parts = []
+    size = 0
+    with response:
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            parts.append(delta)
+            size += len(delta)
+
+            # Only the opening of the reply can hold the label; past that the
+            # model ignored the format, so read the full assessment instead
+            if size <= _LABEL_WINDOW:
+                match = _LABEL_RE.match("".join(parts))
+                if match:
+                    return f"{match.group(1).upper()}. Patient reports: {patient_symptoms}"
+
+    return "".join(parts)
+
+def _is_emergency(triage_result):
+    # Trust the leading label when there is one, so a symptom report that
+    # merely mentions "emergency" doesn't decide the route
+    label = _LABEL_RE.match(triage_result)
+    if label:
+        return label.group(1).upper() == "EMERGENCY"
+    return _EMERGENCY_RE.search(triage_result) is not None
 
 def emergency_specialist(triage_assessment, session_id, patient_id):
     """Agent 2: Emergency Specialist - Handle urgent cases"""
@@ -56,11 +112,11 @@ def emergency_specialist(triage_assessment, session_id, patient_id):
         max_tokens=300,
         temperature=0,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/emergency-specialist",
-            "Helicone-Property-Agent": "emergency-specialist",
-            "Helicone-Property-Department": "emergency-dept",
-            "Helicone-User-Id": patient_id,
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage/emergency-specialist",
+            H_AGENT: "emergency-specialist",
+            H_DEPARTMENT: "emergency-dept",
+            H_USER_ID: patient_id,
         }
     )
     return response.choices[0].message.content
@@ -76,13 +132,13 @@ def routine_specialist(triage_assessment, session_id, patient_id):
         max_tokens=250,
         temperature=0,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/routine-specialist",
-            "Helicone-Property-Agent": "routine-specialist",
-            "Helicone-Property-Department": "primary-care",
-            "Helicone-User-Id": patient_id,
-            "Helicone-Cache-Enabled": "true",
-            "Cache-Control": "max-age=7200",
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage/routine-specialist",
+            H_AGENT: "routine-specialist",
+            H_DEPARTMENT: "primary-care",
+            H_USER_ID: patient_id,
+            H_CACHE_ENABLED: "true",
+            H_CACHE_CONTROL: "max-age=7200",
         }
     )
     return response.choices[0].message.content
@@ -98,44 +154,82 @@ def report_generator(specialist_diagnosis, session_id, patient_id):
         max_tokens=400,
         temperature=0,
         extra_headers={
-            "Helicone-Session-Id": session_id,
-            "Helicone-Session-Path": "/triage/report",
-            "Helicone-Property-Agent": "report-generator",
-            "Helicone-Property-Department": "medical-records",
-            "Helicone-User-Id": patient_id,
+            H_SESSION_ID: session_id,
+            H_SESSION_PATH: "/triage/report",
+            H_AGENT: "report-generator",
+            H_DEPARTMENT: "medical-records",
+            H_USER_ID: patient_id,
         }
     )
     return response.choices[0].message.content
 
-# Example workflow
-if __name__ == "__main__":
-    session_id = str(uuid.uuid4())
-    patient_id = "patient_12345"
-
-    # Patient presents with symptoms
-    symptoms = "Severe chest pain radiating to left arm, shortness of breath, started 20 minutes ago"
-
-    print("🏥 Healthcare Multi-Agent Workflow\n")
+def run_workflow(symptoms, patient_id, verbose=True):
+    """Run triage -> specialist -> report for one patient in its own session"""
+    echo = print if verbose else quiet
+    session_id = secrets.token_hex(16)
 
     # Step 1: Triage
-    print("1️⃣ Triage Agent assessing...")
+    echo("1️⃣ Triage Agent assessing...")
     triage_result = triage_agent(symptoms, session_id, patient_id)
-    print(f"   Result: {triage_result[:100]}...\n")
+    echo(f"   Result: {head(triage_result)}\n")
 
     # Step 2: Route to specialist based on severity
-    if "EMERGENCY" in triage_result.upper():
-        print("2️⃣ Routing to Emergency Specialist...")
+    if _is_emergency(triage_result):
+        echo("2️⃣ Routing to Emergency Specialist...")
         diagnosis = emergency_specialist(triage_result, session_id, patient_id)
     else:
-        print("2️⃣ Routing to Routine Specialist...")
+        echo("2️⃣ Routing to Routine Specialist...")
         diagnosis = routine_specialist(triage_result, session_id, patient_id)
-    print(f"   Diagnosis: {diagnosis[:100]}...\n")
+    echo(f"   Diagnosis: {head(diagnosis)}\n")
 
     # Step 3: Generate report
-    print("3️⃣ Generating Medical Report...")
+    echo("3️⃣ Generating Medical Report...")
     report = report_generator(diagnosis, session_id, patient_id)
-    print(f"   Report: {report[:100]}...\n")
+    echo(f"   Report: {head(report)}\n")
+
+    return {"patient_id": patient_id, "session_id": session_id, "report": report}
+
+def run_cohort(patients, max_workers=COHORT_WORKERS):
+    """Run the workflow for many (patient_id, symptoms) pairs, yielding results as they finish"""
+    # The pool size bounds how many patients are in flight, so a large cohort
+    # doesn't open more connections than the client's pool holds or flood the
+    # gateway. A failed patient yields {"patient_id", "error"} instead of
+    # stopping the rest of the cohort.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_workflow, symptoms, patient_id, verbose=False): patient_id
+            for patient_id, symptoms in patients
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"patient_id": futures[future], "error": e}
+
+# Example workflow
+if __name__ == "__main__":
+    patient_id = "patient_12345"
+
+    # Patient presents with symptoms
+    symptoms = "Severe chest pain radiating to left arm, shortness of breath, started 20 minutes ago"
+
+    print("🏥 Healthcare Multi-Agent Workflow\n")
+
+    # Pass --cohort to run several patients concurrently instead
+    if "--cohort" in sys.argv:
+        patients = [
+            (patient_id, symptoms),
+            ("patient_23456", "Mild seasonal allergies, itchy eyes, sneezing"),
+            ("patient_34567", "Sudden weakness on one side of the face, slurred speech"),
+        ]
+        for result in run_cohort(patients):
+            if "error" in result:
+                print(f"   {result['patient_id']}: ❌ {result['error']}")
+            else:
+                print(f"   {result['patient_id']}: {head(result['report'], 80)} (session {result['session_id']})")
+    else:
+        session_id = run_workflow(symptoms, patient_id)["session_id"]
 
-    print(f"✅ Workflow complete! Session ID: {session_id}")
-    print(f"📊 View session tree in Helicone dashboard:")
-    print(f"   /triage → /triage/emergency-specialist → /triage/report")
+        print(f"✅ Workflow complete! Session ID: {session_id}")
+        print(f"📊 View session tree in Helicone dashboard:")
+        print(f"   /triage → /triage/emergency-specialist → /triage/report")
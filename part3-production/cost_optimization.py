@@ -9,16 +9,39 @@ Demonstrates 5 proven techniques to reduce LLM costs:
 5. Batch processing with shared context
 """
 
-from openai import OpenAI
-import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import tiktoken
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.rate_limit import POLICY_HEADER, POLICY_USER_DAILY_BUDGET, charge, limited_create
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client()
+
+INPUT_PRICE_PER_TOKEN = {"gpt-4o-mini": 0.15 / 1_000_000, "gpt-4o": 2.50 / 1_000_000}
+OUTPUT_PRICE_PER_TOKEN = {"gpt-4o-mini": 0.60 / 1_000_000, "gpt-4o": 10.00 / 1_000_000}
+
+@lru_cache(maxsize=None)
+def _encoder(model: str):
+    # Built once per model on first use rather than at import:
+    # encoding_for_model may have to download the BPE file
+    return tiktoken.encoding_for_model(model)
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(model: str, text: str) -> int:
+    """Count input tokens; repeated prompts (e.g. system prompts) are encoded once."""
+
+    return len(_encoder(model).encode(text))
+
 
 # Strategy 1: Aggressive Caching
 # Save 30-50% by caching common queries for 24 hours
@@ -55,16 +78,25 @@ print(f"   Savings: 94% cost reduction for appropriate queries\n")
 # Strategy 3: Cost-Based Rate Limiting
 # Enforce $5/day budget per user
 print("Strategy 3: Cost-Based Rate Limiting")
-response = client.chat.completions.create(
+budget_headers = {
+    "Helicone-User-Id": "user_001",
+    POLICY_HEADER: POLICY_USER_DAILY_BUDGET.header,  # $5/day
+    "Helicone-Property-Optimization": "rate-limiting",
+}
+# Pre-checked against a local copy of the policy, so an exhausted budget
+# fails here instead of after a round-trip to Helicone
+response = limited_create(
+    client.chat.completions.create,
     model="gpt-4o-mini",
     messages=[{"role": "user", "content": "Budgeted query"}],
     max_tokens=150,
-    extra_headers={
-        "Helicone-User-Id": "user_001",
-        "Helicone-RateLimit-Policy": "500;w=86400;u=cents;s=user",  # $5/day
-        "Helicone-Property-Optimization": "rate-limiting",
-    }
+    extra_headers=budget_headers,
 )
+# The budget is in cents, so deduct what the request actually cost
+charge(budget_headers, 100 * (
+    response.usage.prompt_tokens * INPUT_PRICE_PER_TOKEN["gpt-4o-mini"]
+    + response.usage.completion_tokens * OUTPUT_PRICE_PER_TOKEN["gpt-4o-mini"]
+))
 print(f"   Limit: $5/day per user")
 print(f"   Prevents: Infinite loops, runaway costs, budget overruns")
 print(f"   Returns 429 error when limit exceeded\n")
@@ -73,7 +105,7 @@ print(f"   Returns 429 error when limit exceeded\n")
 # Shorter prompts = lower costs
 print("Strategy 4: Prompt Optimization")
 
-# Bad: Verbose prompt (250 tokens input)
+# Bad: Verbose prompt
 bad_prompt = """
 You are a highly skilled medical AI assistant with extensive knowledge of various medical conditions,
 treatments, and best practices. Please provide a comprehensive, detailed explanation of the following
@@ -84,12 +116,16 @@ without medical training can understand. Be thorough but concise.
 Medical condition: diabetes
 """
 
-# Good: Concise prompt (50 tokens input)
+# Good: Concise prompt
 good_prompt = "Explain diabetes symptoms, causes, and treatment in simple terms."
 
-print(f"   Bad prompt: 250 tokens input = $0.000375")
-print(f"   Good prompt: 50 tokens input = $0.000075")
-print(f"   Savings: 80% reduction in input costs\n")
+bad_tokens = count_tokens("gpt-4o-mini", bad_prompt)
+good_tokens = count_tokens("gpt-4o-mini", good_prompt)
+price = INPUT_PRICE_PER_TOKEN["gpt-4o-mini"]
+
+print(f"   Bad prompt: {bad_tokens} tokens input = ${bad_tokens * price:.8f}")
+print(f"   Good prompt: {good_tokens} tokens input = ${good_tokens * price:.8f}")
+print(f"   Savings: {1 - good_tokens / bad_tokens:.0%} reduction in input costs\n")
 
 # Strategy 5: Batch Processing (Future Feature)
 print("Strategy 5: Batch Processing")
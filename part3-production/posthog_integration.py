@@ -5,16 +5,23 @@ Combine Helicone's LLM observability with PostHog's product analytics.
 Track user behavior, feature adoption, and LLM performance together.
 """
 
-from openai import OpenAI
 import os
+import sys
+from pathlib import Path
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.display import head
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client()
+
+# Read once; the header value is the same for every request
+POSTHOG_API_KEY = os.environ.get("POSTHOG_API_KEY", "")
 
 # Example: Track LLM request with PostHog event
 response = client.chat.completions.create(
@@ -28,14 +35,14 @@ response = client.chat.completions.create(
         "Helicone-Property-Plan": "enterprise",
 
         # PostHog integration
-        "Helicone-PostHog-Key": os.getenv("POSTHOG_API_KEY"),
+        "Helicone-PostHog-Key": POSTHOG_API_KEY,
         "Helicone-PostHog-Host": "https://app.posthog.com",
         "Helicone-PostHog-Event": "llm_report_generated",
     }
 )
 
 print("✅ LLM request tracked in both Helicone and PostHog")
-print(f"Response: {response.choices[0].message.content[:100]}...\n")
+print(f"Response: {head(response.choices[0].message.content)}\n")
 
 print("📊 Combined Analytics:")
 print("   Helicone Dashboard:")
@@ -12,20 +12,59 @@ This example demonstrates a production-ready LLM request with:
 ✅ PostHog integration
 """
 
-from openai import OpenAI
-import os
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.helicone_client import get_client
+from common.rate_limit import POLICY_HEADER, POLICY_USER_HOURLY
+from common.display import head
 from dotenv import load_dotenv
-import uuid
+import secrets
 
 load_dotenv()
 
-client = OpenAI(
-    base_url="https://ai-gateway.helicone.ai",
-    api_key=os.getenv("HELICONE_API_KEY"),
-)
+client = get_client()
+
+# Static headers shared by every request, built once; only the session
+# and user IDs are merged in per call
+_BASE_HEADERS = MappingProxyType({
+    # Custom Properties (for filtering and analytics)
+    "Helicone-Property-Environment": "production",
+    "Helicone-Property-Feature": "medical-assistant",
+    "Helicone-Property-Version": "v2.1.0",
+    "Helicone-Property-Department": "healthcare",
+
+    # Caching
+    "Helicone-Cache-Enabled": "true",
+    "Cache-Control": "max-age=3600",
+
+    # Rate Limiting (100 requests/hour per user)
+    POLICY_HEADER: POLICY_USER_HOURLY.header,  # "100;w=3600;s=user"
+
+    # Security Scanning
+    "Helicone-LLM-Security-Enabled": "true",
+    "Helicone-Prompt-Guard-Enabled": "true",
+
+    # Retry + Fallback
+    "Helicone-Retry-Enabled": "true",
+    "Helicone-Retry-Num": "3",
+    "Helicone-Retry-Factor": "2",
+    "Helicone-Fallback-Enabled": "true",
+
+    # Prompt Versioning
+    "Helicone-Prompt-Id": "medical-query-v2",
+
+    # PostHog Integration (optional)
+    # "Helicone-PostHog-Key": os.getenv("POSTHOG_API_KEY"),
+    # "Helicone-PostHog-Event": "medical_query_completed",
+})
 
 # Production-ready request with full instrumentation
-session_id = str(uuid.uuid4())
+session_id = secrets.token_hex(16)
 
 response = client.chat.completions.create(
     model="gpt-4o-mini/claude-sonnet-4",  # Primary + fallback
@@ -36,48 +75,20 @@ response = client.chat.completions.create(
     max_tokens=300,
     temperature=0,
     extra_headers={
+        **_BASE_HEADERS,
+
         # Session Tracing
         "Helicone-Session-Id": session_id,
         "Helicone-Session-Path": "/production/medical-query",
 
         # User Tracking
         "Helicone-User-Id": "user_12345",
-
-        # Custom Properties (for filtering and analytics)
-        "Helicone-Property-Environment": "production",
-        "Helicone-Property-Feature": "medical-assistant",
-        "Helicone-Property-Version": "v2.1.0",
-        "Helicone-Property-Department": "healthcare",
-
-        # Caching
-        "Helicone-Cache-Enabled": "true",
-        "Cache-Control": "max-age=3600",
-
-        # Rate Limiting (100 requests/hour per user)
-        "Helicone-RateLimit-Policy": "100;w=3600;s=user",
-
-        # Security Scanning
-        "Helicone-LLM-Security-Enabled": "true",
-        "Helicone-Prompt-Guard-Enabled": "true",
-
-        # Retry + Fallback
-        "Helicone-Retry-Enabled": "true",
-        "Helicone-Retry-Num": "3",
-        "Helicone-Retry-Factor": "2",
-        "Helicone-Fallback-Enabled": "true",
-
-        # Prompt Versioning
-        "Helicone-Prompt-Id": "medical-query-v2",
-
-        # PostHog Integration (optional)
-        # "Helicone-PostHog-Key": os.getenv("POSTHOG_API_KEY"),
-        # "Helicone-PostHog-Event": "medical_query_completed",
     }
 )
 
 print("✅ Production Request Complete!")
 print(f"   Session ID: {session_id}")
-print(f"   Response: {response.choices[0].message.content[:100]}...")
+print(f"   Response: {head(response.choices[0].message.content)}")
 print()
 print("📊 Production Features Enabled:")
 print("   ✓ Session tracing (hierarchical path)")